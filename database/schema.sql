@@ -1,12 +1,12 @@
 -- Localization Management Database Schema
 -- Run this in your Supabase SQL editor
 
--- Enable UUID extension
-CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+-- Enable trigram extension for indexed substring search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- Projects table
 CREATE TABLE IF NOT EXISTS projects (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     name VARCHAR(255) NOT NULL,
     description TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL,
@@ -29,7 +29,7 @@ CREATE TABLE IF NOT EXISTS project_languages (
 
 -- Translation keys table
 CREATE TABLE IF NOT EXISTS translation_keys (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     key VARCHAR(255) NOT NULL,
     category VARCHAR(100) NOT NULL,
     description TEXT,
@@ -41,7 +41,7 @@ CREATE TABLE IF NOT EXISTS translation_keys (
 
 -- Translations table
 CREATE TABLE IF NOT EXISTS translations (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     translation_key_id UUID REFERENCES translation_keys(id) ON DELETE CASCADE,
     language_code VARCHAR(10) REFERENCES languages(code) ON DELETE CASCADE,
     value TEXT NOT NULL,
@@ -50,11 +50,37 @@ CREATE TABLE IF NOT EXISTS translations (
     UNIQUE(translation_key_id, language_code)
 );
 
+-- IDs are generated by the database with the built-in gen_random_uuid();
+-- this also moves tables created with uuid-ossp's uuid_generate_v4() over
+ALTER TABLE projects ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE translation_keys ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE translations ALTER COLUMN id SET DEFAULT gen_random_uuid();
+
+-- Words of the key (split on . _ -) and description, for multi-word searches
+ALTER TABLE translation_keys ADD COLUMN IF NOT EXISTS search_tsv tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('simple', translate(key, '._-', '   ') || ' ' || COALESCE(description, ''))
+    ) STORED;
+
 -- Create indexes for better performance
-CREATE INDEX IF NOT EXISTS idx_translation_keys_project_id ON translation_keys(project_id);
-CREATE INDEX IF NOT EXISTS idx_translation_keys_category ON translation_keys(category);
-CREATE INDEX IF NOT EXISTS idx_translations_key_id ON translations(translation_key_id);
+-- Lookups by project_id alone use UNIQUE(project_id, key), and lookups by
+-- translation_key_id use UNIQUE(translation_key_id, language_code)
+CREATE INDEX IF NOT EXISTS idx_translation_keys_project_category ON translation_keys(project_id, category);
+-- Lets the key search (ILIKE '%term%') use an index instead of a sequential scan
+CREATE INDEX IF NOT EXISTS idx_translation_keys_key_trgm ON translation_keys USING gin (key gin_trgm_ops);
+-- Serves prefix searches (LIKE 'term%') regardless of the database collation
+CREATE INDEX IF NOT EXISTS idx_translation_keys_project_key_prefix ON translation_keys(project_id, key text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_translation_keys_search_tsv ON translation_keys USING gin (search_tsv);
 CREATE INDEX IF NOT EXISTS idx_translations_language ON translations(language_code);
+-- Non-blank translations only; backs the missing translation lookup below
+CREATE INDEX IF NOT EXISTS idx_translations_key_language_nonblank ON translations(translation_key_id, language_code)
+    WHERE value ~ '\S';
+
+-- Redundant with the unique constraints and the composite index above; dropped
+-- so they don't slow down writes on existing databases
+DROP INDEX IF EXISTS idx_translation_keys_project_id;
+DROP INDEX IF EXISTS idx_translation_keys_category;
+DROP INDEX IF EXISTS idx_translations_key_id;
 
 -- Insert some default languages
 INSERT INTO languages (code, name, flag) VALUES
@@ -78,12 +104,153 @@ BEGIN
 END;
 $$ language 'plpgsql';
 
--- Create triggers to automatically update updated_at
+-- Create triggers to automatically update updated_at; dropped first so the
+-- file can be re-run on an existing database
+DROP TRIGGER IF EXISTS update_projects_updated_at ON projects;
 CREATE TRIGGER update_projects_updated_at BEFORE UPDATE ON projects
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+DROP TRIGGER IF EXISTS update_translation_keys_updated_at ON translation_keys;
 CREATE TRIGGER update_translation_keys_updated_at BEFORE UPDATE ON translation_keys
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+DROP TRIGGER IF EXISTS update_translations_updated_at ON translations;
 CREATE TRIGGER update_translations_updated_at BEFORE UPDATE ON translations
-    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
\ No newline at end of file
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Per-project, per-language translation counts for analytics, so dashboard
+-- reads are an index lookup instead of a join and aggregate over translations.
+-- Refreshed every minute by pg_cron (see the end of this file); analytics may
+-- lag writes by that long.
+CREATE MATERIALIZED VIEW IF NOT EXISTS translation_completion_mv AS
+    SELECT k.project_id, t.language_code, COUNT(*) AS completed
+    FROM translations t
+    JOIN translation_keys k ON k.id = t.translation_key_id
+    GROUP BY k.project_id, t.language_code;
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY, which doesn't block reads
+CREATE UNIQUE INDEX IF NOT EXISTS idx_translation_completion_mv
+    ON translation_completion_mv(project_id, language_code);
+
+-- Translation completion analytics for a project, built entirely in the
+-- database: the total key count plus completed count, total and percentage
+-- per project language, returned in the API's response shape
+CREATE OR REPLACE FUNCTION translation_analytics(p_project_id UUID)
+RETURNS JSONB AS $$
+    WITH total AS (
+        SELECT COUNT(*) AS total_keys FROM translation_keys WHERE project_id = p_project_id
+    ), completed AS (
+        SELECT language_code, completed
+        FROM translation_completion_mv
+        WHERE project_id = p_project_id
+    )
+    SELECT jsonb_build_object(
+        'project_id', p_project_id,
+        'total_keys', total.total_keys,
+        'completion_by_language', COALESCE((
+            SELECT jsonb_object_agg(pl.language_code, jsonb_build_object(
+                'completed', c.completed,
+                'total', total.total_keys,
+                'percentage', COALESCE(ROUND(100.0 * c.completed / NULLIF(total.total_keys, 0), 2), 0)
+            ))
+            FROM project_languages pl
+            -- The view may still count translations of recently deleted keys
+            CROSS JOIN LATERAL (
+                SELECT LEAST(COALESCE(MAX(mv.completed), 0), total.total_keys) AS completed
+                FROM completed mv
+                WHERE mv.language_code = pl.language_code
+            ) c
+            WHERE pl.project_id = p_project_id
+        ), '{}'::jsonb),
+        'last_updated', NOW()
+    )
+    FROM total;
+$$ LANGUAGE sql STABLE;
+
+-- Translation keys without a non-blank translation for a language. Callers
+-- filter (project, search, category), order and paginate the result through
+-- PostgREST; the function is inlined, so those filters still use the indexes.
+CREATE OR REPLACE FUNCTION translation_keys_missing_language(p_language_code VARCHAR)
+RETURNS SETOF translation_keys AS $$
+    SELECT k.*
+    FROM translation_keys k
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM translations t
+        WHERE t.translation_key_id = k.id
+          AND t.language_code = p_language_code
+          AND t.value ~ '\S'
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Translation keys without a non-blank translation for at least one of their
+-- project's languages. Used like translation_keys_missing_language.
+CREATE OR REPLACE FUNCTION translation_keys_missing_any_language()
+RETURNS SETOF translation_keys AS $$
+    SELECT k.*
+    FROM translation_keys k
+    WHERE EXISTS (
+        SELECT 1
+        FROM project_languages pl
+        WHERE pl.project_id = k.project_id
+          AND NOT EXISTS (
+              SELECT 1
+              FROM translations t
+              WHERE t.translation_key_id = k.id
+                AND t.language_code = pl.language_code
+                AND t.value ~ '\S'
+          )
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Create a translation key and its initial translations in one statement, so
+-- a failed translation insert never leaves an orphaned key. Returns the key
+-- with its translations as JSON.
+CREATE OR REPLACE FUNCTION create_translation_key_with_translations(
+    p_key VARCHAR,
+    p_category VARCHAR,
+    p_project_id UUID,
+    p_description TEXT,
+    p_translations JSONB
+)
+RETURNS JSONB AS $$
+    WITH new_key AS (
+        INSERT INTO translation_keys (key, category, project_id, description)
+        VALUES (p_key, p_category, p_project_id, p_description)
+        RETURNING id, key, category, description
+    ), new_translations AS (
+        INSERT INTO translations (translation_key_id, language_code, value)
+        SELECT new_key.id, t.key, t.value
+        FROM new_key, jsonb_each_text(COALESCE(p_translations, '{}'::jsonb)) AS t
+        RETURNING language_code, value, updated_at, updated_by
+    )
+    SELECT jsonb_build_object(
+        'id', new_key.id,
+        'key', new_key.key,
+        'category', new_key.category,
+        'description', new_key.description,
+        'translations', COALESCE((SELECT jsonb_agg(to_jsonb(nt)) FROM new_translations nt), '[]'::jsonb)
+    )
+    FROM new_key;
+$$ LANGUAGE sql;
+
+-- Optional: refresh translation_completion_mv every minute with pg_cron,
+-- which Supabase provides. Skipped with a notice where pg_cron is not
+-- available, e.g. plain Postgres for local development; refresh the view
+-- by hand there with REFRESH MATERIALIZED VIEW translation_completion_mv.
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_cron') THEN
+        RAISE NOTICE 'pg_cron is not available; translation_completion_mv will not be refreshed automatically';
+        RETURN;
+    END IF;
+
+    CREATE EXTENSION IF NOT EXISTS pg_cron;
+    -- Scheduling by name replaces an existing job, so re-running is safe
+    PERFORM cron.schedule(
+        'refresh-translation-completion',
+        '* * * * *',
+        'REFRESH MATERIALIZED VIEW CONCURRENTLY translation_completion_mv'
+    );
+END
+$$;
@@ -10,10 +10,13 @@ from src.localization_management_api.config import get_settings
 def main():
     """Run the FastAPI server"""
     settings = get_settings()
+    # Auto-reload only works with a single worker process
+    workers = 1 if settings.debug else settings.api_workers
 
     print("🚀 Starting Localization Management API")
     print(f"📍 Host: {settings.api_host}")
     print(f"🔌 Port: {settings.api_port}")
+    print(f"👷 Workers: {workers}")
     print(f"🐛 Debug: {settings.debug}")
     print(f"🌐 Frontend URL: {settings.frontend_url}")
     print("=" * 50)
@@ -23,6 +26,7 @@ def main():
         host=settings.api_host,
         port=settings.api_port,
         reload=settings.debug,
+        workers=workers,
         log_level="info" if not settings.debug else "debug"
     )
 
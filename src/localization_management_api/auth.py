@@ -1,123 +1,282 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional
+import asyncio
 import jwt
+from jwt.algorithms import HMACAlgorithm
+import bcrypt
 import hashlib
+import logging
 import secrets
-from .models import User, LoginRequest, RegisterRequest, LoginResponse
+import sqlite3
+import threading
+import time
+from cachetools import TTLCache
+from .config import get_settings
+from .models import User, LoginRequest, RegisterRequest, LoginResponse, MAX_PASSWORD_BYTES
 
-# Simple in-memory storage for demo purposes
-# In production, this should be a proper database
-USERS_DB = {}
-ACTIVE_TOKENS = set()
+logger = logging.getLogger(__name__)
+
+# Users and active tokens live in a SQLite database so that every uvicorn
+# worker on the host sees the same accounts and token revocations
+AUTH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL UNIQUE,
+    full_name TEXT NOT NULL,
+    password_hash BLOB NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    is_active INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS active_tokens (
+    digest BLOB PRIMARY KEY,
+    user_id TEXT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    expires_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_active_tokens_expires_at ON active_tokens(expires_at);
+"""
+
+# One connection per thread; sqlite3 connections must not be shared
+_connections = threading.local()
 
 # JWT Configuration
-JWT_SECRET = "your-secret-key-change-this-in-production"
+JWT_SECRET = get_settings().jwt_secret
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
+_JWT_EXPIRATION_SECONDS = JWT_EXPIRATION_HOURS * 3600
+# Prepare the HMAC key once; hashlib/hmac are OpenSSL-backed, so signing
+# already uses the CPU's SHA extensions where available
+_JWT_KEY = HMACAlgorithm(HMACAlgorithm.SHA256).prepare_key(JWT_SECRET)
+_JWT_ENCODE_KWARGS = {"key": _JWT_KEY, "algorithm": JWT_ALGORITHM}
+_JWT_DECODE_KWARGS = {
+    "key": _JWT_KEY,
+    "algorithms": [JWT_ALGORITHM],
+    "options": {"require": ["exp", "sub"]}
+}
+
+# Password hashing configuration
+BCRYPT_ROUNDS = 12
+
+# Short-lived cache of recently verified credentials so repeated logins
+# skip the bcrypt work. Keys are digests, never raw passwords.
+_LOGIN_CACHE = TTLCache(maxsize=4096, ttl=30)
+_LOGIN_CACHE_LOCK = threading.Lock()
+
+def _token_digest(token: str) -> bytes:
+    """Short digest used in place of the raw token for storage and lookups"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+# Recently verified JWTs, keyed by token digest, so hot requests skip the
+# database and signature verification. A logout on another worker takes
+# effect here once the entry expires.
+_JWT_CACHE = TTLCache(maxsize=10000, ttl=5)
+_JWT_CACHE_LOCK = threading.Lock()
+
+def get_auth_connection() -> sqlite3.Connection:
+    """Get this thread's connection to the auth database"""
+    conn = getattr(_connections, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(get_settings().auth_db_path, timeout=5, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(AUTH_SCHEMA)
+        _connections.conn = conn
+    return conn
+
+def _row_to_user(row: sqlite3.Row) -> User:
+    """Build a User from a users table row"""
+    return User(
+        id=row["id"],
+        username=row["username"],
+        email=row["email"],
+        full_name=row["full_name"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+        is_active=bool(row["is_active"])
+    )
 
 class AuthService:
     @staticmethod
-    def hash_password(password: str) -> str:
-        """Hash password using SHA-256 with salt"""
-        salt = "localization-salt"  # In production, use random salt per user
-        return hashlib.sha256((password + salt).encode()).hexdigest()
+    def hash_password(password: str) -> bytes:
+        """Hash password using bcrypt with a random per-user salt"""
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(BCRYPT_ROUNDS))
 
     @staticmethod
-    def verify_password(password: str, hashed: str) -> bool:
+    def verify_password(password: str, hashed: bytes) -> bool:
         """Verify password against hash"""
-        return AuthService.hash_password(password) == hashed
+        password_bytes = password.encode()
+        # Registration caps passwords at bcrypt's limit, so a longer one can't match
+        if len(password_bytes) > MAX_PASSWORD_BYTES:
+            return False
+        return bcrypt.checkpw(password_bytes, hashed)
+
+    @staticmethod
+    def _credentials_key(username: str, password: str) -> bytes:
+        """Build the login cache key for a username/password pair"""
+        return hashlib.sha256(username.encode() + b"\0" + password.encode()).digest()
 
     @staticmethod
     def create_user(register_data: RegisterRequest) -> User:
         """Create a new user"""
-        user_id = secrets.token_urlsafe(16)
-
-        # Check if username already exists
-        for user_data in USERS_DB.values():
-            user = user_data["user"]
-            if user.username == register_data.username:
-                raise ValueError("Username already exists")
-            if user.email == register_data.email:
-                raise ValueError("Email already exists")
-
+        now = datetime.now()
         user = User(
-            id=user_id,
+            id=secrets.token_urlsafe(16),
             username=register_data.username,
             email=register_data.email,
             full_name=register_data.full_name,
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
+            created_at=now,
+            updated_at=now,
             is_active=True
         )
 
-        # Store user with hashed password
-        USERS_DB[user_id] = {
-            "user": user,
-            "password_hash": AuthService.hash_password(register_data.password)
-        }
+        # Store user with hashed password; the unique constraints reject
+        # existing usernames and emails
+        try:
+            get_auth_connection().execute(
+                """
+                INSERT INTO users (id, username, email, full_name, password_hash, created_at, updated_at, is_active)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    user.id, user.username, user.email, user.full_name,
+                    AuthService.hash_password(register_data.password),
+                    user.created_at.isoformat(), user.updated_at.isoformat(), int(user.is_active)
+                )
+            )
+        except sqlite3.IntegrityError as e:
+            if "users.username" in str(e):
+                raise ValueError("Username already exists")
+            if "users.email" in str(e):
+                raise ValueError("Email already exists")
+            raise
 
         return user
 
+    @staticmethod
+    def delete_user(user_id: str) -> bool:
+        """Delete a user along with their active tokens"""
+        cursor = get_auth_connection().execute("DELETE FROM users WHERE id = ?", (user_id,))
+        return cursor.rowcount > 0
+
     @staticmethod
     def authenticate_user(login_data: LoginRequest) -> Optional[User]:
         """Authenticate user with username/password"""
-        for user_data in USERS_DB.values():
-            user = user_data["user"]
-            if (user.username == login_data.username and
-                AuthService.verify_password(login_data.password, user_data["password_hash"]) and
-                user.is_active):
-                return user
-        return None
+        row = get_auth_connection().execute(
+            "SELECT * FROM users WHERE username = ?", (login_data.username,)
+        ).fetchone()
+        if row is None or not row["is_active"]:
+            return None
+
+        user = _row_to_user(row)
+        cache_key = AuthService._credentials_key(login_data.username, login_data.password)
+        with _LOGIN_CACHE_LOCK:
+            cached_user_id = _LOGIN_CACHE.get(cache_key)
+        if cached_user_id == user.id:
+            return user
+
+        if not AuthService.verify_password(login_data.password, row["password_hash"]):
+            return None
+
+        with _LOGIN_CACHE_LOCK:
+            _LOGIN_CACHE[cache_key] = user.id
+        return user
 
     @staticmethod
     def create_access_token(user: User) -> str:
         """Create JWT access token"""
-        expire = datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)
+        now = int(time.time())
         payload = {
             "sub": user.id,
             "username": user.username,
-            "exp": expire,
-            "iat": datetime.utcnow()
+            # Unique per session, so logins in the same second get distinct
+            # tokens that can be revoked separately
+            "jti": secrets.token_urlsafe(16),
+            "exp": now + _JWT_EXPIRATION_SECONDS,
+            "iat": now
         }
-        token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
-        ACTIVE_TOKENS.add(token)
+        token = jwt.encode(payload, **_JWT_ENCODE_KWARGS)
+
+        conn = get_auth_connection()
+        conn.execute("DELETE FROM active_tokens WHERE expires_at <= ?", (now,))
+        conn.execute(
+            "INSERT INTO active_tokens (digest, user_id, expires_at) VALUES (?, ?, ?)",
+            (_token_digest(token), user.id, payload["exp"])
+        )
         return token
 
+    @staticmethod
+    def _get_cached_user(digest: bytes) -> Optional[User]:
+        """Return the user for a recently verified token digest, if cached"""
+        with _JWT_CACHE_LOCK:
+            cached = _JWT_CACHE.get(digest)
+        if cached is None:
+            return None
+
+        user, expires_at = cached
+        if expires_at > time.time():
+            return user
+        return None
+
     @staticmethod
     def verify_token(token: str) -> Optional[User]:
         """Verify JWT token and return user"""
         try:
-            if token not in ACTIVE_TOKENS:
+            digest = _token_digest(token)
+            user = AuthService._get_cached_user(digest)
+            if user is not None:
+                return user
+
+            row = get_auth_connection().execute(
+                """
+                SELECT u.* FROM active_tokens t JOIN users u ON u.id = t.user_id
+                WHERE t.digest = ? AND t.expires_at > ?
+                """,
+                (digest, int(time.time()))
+            ).fetchone()
+            if row is None:
                 return None
 
-            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-            user_id = payload.get("sub")
+            payload = jwt.decode(token, **_JWT_DECODE_KWARGS)
+            if payload.get("sub") != row["id"]:
+                return None
 
-            if user_id and user_id in USERS_DB:
-                return USERS_DB[user_id]["user"]
-            return None
+            user = _row_to_user(row)
+            with _JWT_CACHE_LOCK:
+                _JWT_CACHE[digest] = (user, payload["exp"])
+            return user
         except jwt.PyJWTError:
             return None
 
+    @staticmethod
+    async def verify_token_async(token: str) -> Optional[User]:
+        """Verify JWT token, querying and decoding in a worker thread on cache misses"""
+        user = AuthService._get_cached_user(_token_digest(token))
+        if user is not None:
+            return user
+        return await asyncio.to_thread(AuthService.verify_token, token)
+
     @staticmethod
     def logout(token: str) -> bool:
         """Logout user by invalidating token"""
-        if token in ACTIVE_TOKENS:
-            ACTIVE_TOKENS.remove(token)
-            return True
-        return False
+        digest = _token_digest(token)
+        with _JWT_CACHE_LOCK:
+            _JWT_CACHE.pop(digest, None)
+        cursor = get_auth_connection().execute("DELETE FROM active_tokens WHERE digest = ?", (digest,))
+        return cursor.rowcount > 0
 
     @staticmethod
     def get_user_by_id(user_id: str) -> Optional[User]:
         """Get user by ID"""
-        if user_id in USERS_DB:
-            return USERS_DB[user_id]["user"]
-        return None
+        row = get_auth_connection().execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
+        return _row_to_user(row) if row else None
 
 # Create a default admin user for testing
 def initialize_default_users():
     """Initialize default users for testing"""
-    if not USERS_DB:  # Only create if no users exist
+    has_users = get_auth_connection().execute("SELECT 1 FROM users LIMIT 1").fetchone()
+    if not has_users:  # Only create if no users exist
         admin_user = RegisterRequest(
             username="admin",
             email="admin@example.com",
@@ -135,9 +294,8 @@ def initialize_default_users():
         try:
             AuthService.create_user(admin_user)
             AuthService.create_user(demo_user)
-            print("Default users created: admin/admin123, demo/demo123")
+            # Logged as a warning since these well-known credentials must not
+            # survive into production
+            logger.warning("Default users created: admin/admin123, demo/demo123")
         except ValueError as e:
-            print(f"Users already exist: {e}")
-
-# Initialize default users
-initialize_default_users()
\ No newline at end of file
+            logger.warning("Users already exist: %s", e)
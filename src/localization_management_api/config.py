@@ -1,16 +1,29 @@
-from pydantic_settings import BaseSettings
+import os
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Optional
+
+def default_workers() -> int:
+    """Worker count when API_WORKERS is unset: WEB_CONCURRENCY, else one per CPU"""
+    web_concurrency = os.environ.get("WEB_CONCURRENCY")
+    if web_concurrency:
+        return int(web_concurrency)
+    return os.cpu_count() or 1
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
     supabase_url: str
     supabase_service_key: str
+    database_url: Optional[str] = None
     api_host: str = "localhost"
     api_port: int = 8000
+    api_workers: int = Field(default_factory=default_workers)
     debug: bool = True
     frontend_url: str = "http://localhost:3000"
-
-    class Config:
-        env_file = ".env"
+    auth_db_path: str = "auth.db"
+    jwt_secret: str = "your-secret-key-change-this-in-production"
 
 @lru_cache()
 def get_settings():
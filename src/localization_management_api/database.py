@@ -1,11 +1,74 @@
-from supabase import create_client, Client
+from typing import Optional
+import asyncpg
+import orjson
+from supabase import acreate_client, AsyncClient
 from .config import get_settings
 
 settings = get_settings()
 
-def get_supabase_client() -> Client:
+# Global client instance, created once per worker by the app lifespan so
+# PostgREST connections are kept alive and reused across requests
+_client: Optional[AsyncClient] = None
+
+async def connect_supabase() -> AsyncClient:
+    """Create the shared Supabase client instance"""
+    global _client
+    if _client is None:
+        _client = await acreate_client(settings.supabase_url, settings.supabase_service_key)
+    return _client
+
+async def disconnect_supabase() -> None:
+    """Close the shared Supabase client's HTTP connections"""
+    global _client
+    if _client is not None:
+        await _client.postgrest.aclose()
+        _client = None
+
+def get_supabase_client() -> AsyncClient:
     """Get Supabase client instance"""
-    return create_client(settings.supabase_url, settings.supabase_service_key)
+    if _client is None:
+        raise RuntimeError("Supabase client is not connected; it is created in the app lifespan")
+    return _client
+
+# Optional direct Postgres pool for hot-path queries, used instead of
+# PostgREST when DATABASE_URL is configured
+_pool: Optional[asyncpg.Pool] = None
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Decode json and jsonb values with orjson on every new pool connection"""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name,
+            encoder=lambda value: orjson.dumps(value).decode(),
+            decoder=orjson.loads,
+            schema="pg_catalog"
+        )
+
+async def connect_postgres() -> Optional[asyncpg.Pool]:
+    """Create the shared Postgres connection pool if DATABASE_URL is set"""
+    global _pool
+    if _pool is None and settings.database_url:
+        # asyncpg prepares each distinct query text once per connection and
+        # reuses the statement, so the fixed SQL of the hot paths is parsed and
+        # planned once instead of on every call. Cached statements never expire,
+        # as the schema is only changed by migrations.
+        _pool = await asyncpg.create_pool(
+            settings.database_url,
+            min_size=5,
+            max_size=20,
+            statement_cache_size=256,
+            max_cached_statement_lifetime=0,
+            init=_init_connection
+        )
+    return _pool
+
+async def disconnect_postgres() -> None:
+    """Close the shared Postgres connection pool"""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
 
-# Global client instance
-supabase: Client = get_supabase_client()
+def get_postgres_pool() -> Optional[asyncpg.Pool]:
+    """Get the Postgres pool, or None when all queries go through PostgREST"""
+    return _pool
@@ -1,56 +1,92 @@
-from fastapi import FastAPI, HTTPException, Query, Depends, Header
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Depends, Header, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import List, Optional
+from pydantic import ValidationError
 from .config import get_settings
-from .services import TranslationService
-from .auth import AuthService
+from .database import connect_supabase, disconnect_supabase, connect_postgres, disconnect_postgres
+from .services import TranslationService, BulkUpdateError
+from .auth import AuthService, initialize_default_users
 from .models import (
     TranslationKey, GetTranslationKeysResponse, CreateTranslationKeyRequest,
     UpdateTranslationRequest, CreateTranslationRequest, BulkUpdateRequest, AnalyticsResponse, Project, Language,
     User, LoginRequest, LoginResponse, RegisterRequest
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect to Supabase and Postgres and seed default users once the worker has started"""
+    await connect_supabase()
+    await connect_postgres()
+    await asyncio.to_thread(initialize_default_users)
+    yield
+    await disconnect_postgres()
+    await disconnect_supabase()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Localization Management API",
     description="API for managing translation keys and localized content",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Settings
 settings = get_settings()
+CORS_ORIGINS = tuple(dict.fromkeys([settings.frontend_url, "http://localhost:3000"]))
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[settings.frontend_url, "http://localhost:3000"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
+# NDJSON streams are sent uncompressed: zlib would hold their rows back
+# until the whole stream had been generated
+UNCOMPRESSED_PATH_SUFFIXES = ("/translation-keys/stream",)
+
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """GZip middleware that passes streaming endpoints through untouched"""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith(UNCOMPRESSED_PATH_SUFFIXES):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# Compress larger JSON payloads such as translation key listings
+app.add_middleware(StreamingAwareGZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Initialize services
 translation_service = TranslationService()
 
 # Dependency to get translation service
-def get_translation_service() -> TranslationService:
+async def get_translation_service() -> TranslationService:
     return translation_service
 
-# Authentication dependency
-def get_current_user(authorization: Optional[str] = Header(None)) -> Optional[User]:
-    """Get current authenticated user from Authorization header"""
-    if not authorization:
+def get_bearer_token(authorization: Optional[str]) -> Optional[str]:
+    """Extract the token from a "Bearer <token>" Authorization header"""
+    if not authorization or authorization[:7].lower() != "bearer ":
         return None
+    return authorization[7:] or None
 
-    try:
-        scheme, token = authorization.split()
-        if scheme.lower() != "bearer":
-            return None
-        return AuthService.verify_token(token)
-    except ValueError:
+# Authentication dependency
+async def get_current_user(authorization: Optional[str] = Header(None)) -> Optional[User]:
+    """Get current authenticated user from Authorization header"""
+    token = get_bearer_token(authorization)
+    if token is None:
         return None
+    return await AuthService.verify_token_async(token)
 
-def require_auth(current_user: Optional[User] = Depends(get_current_user)) -> User:
+async def require_auth(current_user: Optional[User] = Depends(get_current_user)) -> User:
     """Require authentication for protected endpoints"""
     if not current_user:
         raise HTTPException(
@@ -60,9 +96,12 @@ def require_auth(current_user: Optional[User] = Depends(get_current_user)) -> Us
         )
     return current_user
 
+# Constant health payload, serialized once
+HEALTH_RESPONSE_BODY = b'{"status":"healthy","timestamp":"2024-01-01T00:00:00Z"}'
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": "2024-01-01T00:00:00Z"}
+    return Response(content=HEALTH_RESPONSE_BODY, media_type="application/json")
 
 # Projects endpoints
 @app.get("/projects", response_model=List[Project])
@@ -71,15 +110,21 @@ async def get_projects(service: TranslationService = Depends(get_translation_ser
     return await service.get_projects()
 
 # Translation Keys endpoints
+
+# "*" is only allowed as the trailing prefix marker: PostgREST reads any
+# other "*" as a wildcard, which the direct Postgres path would not
+SEARCH_PATTERN = r"^(?:[^*]+\*?)?$"
+
 @app.get("/projects/{project_id}/translation-keys", response_model=GetTranslationKeysResponse)
 async def get_translation_keys(
     project_id: str,
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
-    search: Optional[str] = Query(None),
+    search: Optional[str] = Query(None, pattern=SEARCH_PATTERN),
     category: Optional[str] = Query(None),
     language_code: Optional[str] = Query(None),
     missing_translations: Optional[bool] = Query(None),
+    exact_count: bool = Query(False),
     service: TranslationService = Depends(get_translation_service)
 ):
     """Get translation keys for a project with optional filtering"""
@@ -91,18 +136,36 @@ async def get_translation_keys(
             search=search,
             category=category,
             language_code=language_code,
-            missing_translations=missing_translations
+            missing_translations=missing_translations,
+            exact_count=exact_count
         )
 
-        return GetTranslationKeysResponse(
+        # Serialize once in pydantic-core; returning a Response skips FastAPI's
+        # dump-and-revalidate of the response model (still used for the docs)
+        response = GetTranslationKeysResponse(
             keys=keys,
             total=total,
             page=page,
             limit=limit
         )
+        return Response(content=response.model_dump_json(), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch translation keys: {str(e)}")
 
+@app.get("/projects/{project_id}/translation-keys/stream")
+async def stream_translation_keys(
+    project_id: str,
+    search: Optional[str] = Query(None, pattern=SEARCH_PATTERN),
+    category: Optional[str] = Query(None),
+    service: TranslationService = Depends(get_translation_service)
+):
+    """Stream all translation keys of a project as newline-delimited JSON"""
+    async def generate():
+        async for key in service.iter_translation_keys(project_id, search=search, category=category):
+            yield key.model_dump_json().encode() + b"\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @app.get("/translation-keys/{key_id}", response_model=TranslationKey)
 async def get_translation_key(
     key_id: str,
@@ -138,14 +201,9 @@ async def delete_translation_key(
 ):
     """Delete a translation key and all its associated translations"""
     try:
-        # Check if translation key exists
-        existing_key = await service.get_translation_key_by_id(key_id)
-        if not existing_key:
-            raise HTTPException(status_code=404, detail="Translation key not found")
-
         success = await service.delete_translation_key(key_id)
         if not success:
-            raise HTTPException(status_code=400, detail="Failed to delete translation key")
+            raise HTTPException(status_code=404, detail="Translation key not found")
 
         return {
             "success": True,
@@ -187,27 +245,20 @@ async def create_translation(
 ):
     """Create a new translation for an existing translation key"""
     try:
-        # Check if translation key exists
-        translation_key = await service.get_translation_key_by_id(request.key_id)
-        if not translation_key:
-            raise HTTPException(status_code=404, detail="Translation key not found")
-
-        # Check if translation already exists for this language
-        if request.language_code in translation_key.translations:
-            raise HTTPException(
-                status_code=409,
-                detail=f"Translation already exists for language '{request.language_code}'. Use PUT to update."
-            )
-
-        success = await service.update_translation(
+        created = await service.create_translation_if_absent(
             key_id=request.key_id,
             language_code=request.language_code,
             value=request.value,
             updated_by=current_user.username
         )
 
-        if not success:
-            raise HTTPException(status_code=400, detail="Failed to create translation")
+        if created is None:
+            raise HTTPException(status_code=404, detail="Translation key not found")
+        if not created:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Translation already exists for language '{request.language_code}'. Use PUT to update."
+            )
 
         return {
             "success": True,
@@ -220,31 +271,58 @@ async def create_translation(
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to create translation: {str(e)}")
 
-@app.post("/translations/bulk-update")
+async def parse_bulk_update_request(request: Request) -> BulkUpdateRequest:
+    """Validate the bulk update body straight from the raw JSON bytes"""
+    try:
+        return BulkUpdateRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        # Match the error locations FastAPI reports for regular body parameters
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)
+        ])
+
+@app.post(
+    "/translations/bulk-update",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": "#/components/schemas/BulkUpdateRequest"}
+                }
+            }
+        }
+    }
+)
 async def bulk_update_translations(
-    request: BulkUpdateRequest,
+    # Declared first so unauthenticated requests are rejected before the body is read
     current_user: User = Depends(require_auth),
+    request: BulkUpdateRequest = Depends(parse_bulk_update_request),
     service: TranslationService = Depends(get_translation_service)
 ):
     """Bulk update multiple translations"""
+    # Repeated (key, language) pairs are written once, with the last value
+    unique_requested = len({(update.key_id, update.language_code) for update in request.updates})
     try:
-        updates = [
-            {
-                "key_id": update.key_id,
-                "language_code": update.language_code,
-                "value": update.value,
-                "updated_by": current_user.username
-            }
-            for update in request.updates
-        ]
-
-        success_count = await service.bulk_update_translations(updates)
+        success_count = await service.bulk_update_translations(
+            request.updates,
+            updated_by=current_user.username
+        )
         return {
             "success": True,
-            "message": f"Updated {success_count} out of {len(request.updates)} translations",
+            "message": f"Updated {success_count} out of {unique_requested} translations",
             "updated_count": success_count,
+            "unique_requested": unique_requested,
             "total_requested": len(request.updates)
         }
+    except BulkUpdateError as e:
+        # Earlier batches were saved; tell the client how many rows landed
+        raise HTTPException(status_code=400, detail={
+            "message": f"Failed to bulk update translations: {str(e)}",
+            "updated_count": e.updated_count,
+            "unique_requested": unique_requested,
+            "total_requested": len(request.updates)
+        })
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to bulk update translations: {str(e)}")
 
@@ -260,12 +338,29 @@ async def get_analytics(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch analytics: {str(e)}")
 
+# Legacy endpoints
+@app.get("/localizations/{project_id}/{locale}")
+async def get_localizations(
+    project_id: str,
+    locale: str,
+    service: TranslationService = Depends(get_translation_service)
+):
+    """Get flat key-value translations for a single locale"""
+    try:
+        return {
+            "project_id": project_id,
+            "locale": locale,
+            "localizations": await service.get_localizations(project_id, locale)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch localizations: {str(e)}")
+
 # Authentication endpoints
 @app.post("/auth/register", response_model=User)
 async def register(request: RegisterRequest):
     """Register a new user"""
     try:
-        user = AuthService.create_user(request)
+        user = await asyncio.to_thread(AuthService.create_user, request)
         return user
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -273,14 +368,14 @@ async def register(request: RegisterRequest):
 @app.post("/auth/login", response_model=LoginResponse)
 async def login(request: LoginRequest):
     """Login user and get access token"""
-    user = AuthService.authenticate_user(request)
+    user = await asyncio.to_thread(AuthService.authenticate_user, request)
     if not user:
         raise HTTPException(
             status_code=401,
             detail="Invalid username or password"
         )
 
-    access_token = AuthService.create_access_token(user)
+    access_token = await asyncio.to_thread(AuthService.create_access_token, user)
     return LoginResponse(
         user=user,
         access_token=access_token,
@@ -290,18 +385,30 @@ async def login(request: LoginRequest):
 @app.post("/auth/logout")
 async def logout(current_user: User = Depends(require_auth), authorization: str = Header(...)):
     """Logout user and invalidate token"""
-    try:
-        _, token = authorization.split()
-        success = AuthService.logout(token)
-        return {"success": success, "message": "Logged out successfully"}
-    except ValueError:
+    token = get_bearer_token(authorization)
+    if token is None:
         raise HTTPException(status_code=400, detail="Invalid authorization header")
 
+    success = await asyncio.to_thread(AuthService.logout, token)
+    return {"success": success, "message": "Logged out successfully"}
+
 @app.get("/auth/me", response_model=User)
 async def get_current_user_info(current_user: User = Depends(require_auth)):
     """Get current user information"""
     return current_user
 
+def openapi() -> dict:
+    """Build the OpenAPI schema, adding the bodies parsed by hand to its components"""
+    if app.openapi_schema is None:
+        schemas = FastAPI.openapi(app)["components"]["schemas"]
+        schema = BulkUpdateRequest.model_json_schema(ref_template="#/components/schemas/{model}")
+        for name, definition in schema.pop("$defs", {}).items():
+            schemas.setdefault(name, definition)
+        schemas["BulkUpdateRequest"] = schema
+    return app.openapi_schema
+
+app.openapi = openapi
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host=settings.api_host, port=settings.api_port, reload=settings.debug)
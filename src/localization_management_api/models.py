@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, List, Optional, Union
 from datetime import datetime
 
 class Translation(BaseModel):
@@ -67,7 +67,7 @@ class ValidationResponse(BaseModel):
 class AnalyticsResponse(BaseModel):
     project_id: str
     total_keys: int
-    completion_by_language: Dict[str, Dict[str, int]]
+    completion_by_language: Dict[str, Dict[str, Union[int, float]]]
     last_updated: datetime
 
 class User(BaseModel):
@@ -89,8 +89,18 @@ class LoginResponse(BaseModel):
     token_type: str = "bearer"
     expires_in: int = 3600  # 1 hour
 
+# bcrypt only hashes the first 72 bytes of a password and rejects longer ones
+MAX_PASSWORD_BYTES = 72
+
 class RegisterRequest(BaseModel):
     username: str
     email: str
     password: str
-    full_name: str
\ No newline at end of file
+    full_name: str
+
+    @field_validator("password")
+    @classmethod
+    def check_password_length(cls, password: str) -> str:
+        if len(password.encode()) > MAX_PASSWORD_BYTES:
+            raise ValueError(f"Password must be at most {MAX_PASSWORD_BYTES} bytes")
+        return password
\ No newline at end of file
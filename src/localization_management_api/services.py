@@ -1,11 +1,159 @@
-from typing import List, Dict, Optional, Tuple
+import asyncio
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from datetime import datetime
-from .database import supabase
-from .models import TranslationKey, Translation, Language, Project
-import uuid
+from cachetools import TTLCache
+import asyncpg
+from postgrest import ReturnMethod
+from postgrest.exceptions import APIError
+from supabase import AsyncClient
+from .database import get_supabase_client, get_postgres_pool
+from .models import TranslationKey, Translation, Language, Project, UpdateTranslationRequest
+
+# Columns selected for a translation key along with its embedded translations
+TRANSLATION_KEY_COLUMNS = """
+    id, key, category, description,
+    translations(language_code, value, updated_at, updated_by)
+"""
+
+# A translation key's translations as a json array, for selects whose
+# translation key is aliased k. Shared by the listing, stream and by-id
+# queries so they return the same translation fields.
+TRANSLATIONS_JSON_SQL = """(
+    SELECT json_agg(json_build_object(
+        'language_code', t.language_code,
+        'value', t.value,
+        'updated_at', t.updated_at,
+        'updated_by', t.updated_by
+    ))
+    FROM translations t
+    WHERE t.translation_key_id = k.id
+) AS translations"""
+
+# One page of translation keys, with embedded translations, plus the total
+# number of matching keys. {source} is translation_keys or one of the missing
+# translation functions; the conditions and parameters are built by the caller.
+TRANSLATION_KEYS_PAGE_SQL = f"""
+WITH matched AS (
+    SELECT k.id, k.key, k.category, k.description
+    FROM {{source}} k
+    WHERE {{conditions}}
+)
+SELECT
+    (SELECT COUNT(*) FROM matched) AS total,
+    (
+        SELECT json_agg(page ORDER BY page.key)
+        FROM (
+            SELECT k.id, k.key, k.category, k.description, {TRANSLATIONS_JSON_SQL}
+            FROM matched k
+            ORDER BY k.key
+            LIMIT ${{limit}} OFFSET ${{offset}}
+        ) page
+    ) AS keys
+"""
+
+# Every matching translation key with its translations, in key order, for
+# reading through a cursor. The conditions are built by the caller.
+TRANSLATION_KEYS_STREAM_SQL = f"""
+SELECT k.id::text AS id, k.key, k.category, k.description, {TRANSLATIONS_JSON_SQL}
+FROM translation_keys k
+WHERE {{conditions}}
+ORDER BY k.key
+"""
+
+# A single translation key with its translations as a json array
+TRANSLATION_KEY_BY_ID_SQL = f"""
+SELECT k.id::text AS id, k.key, k.category, k.description, {TRANSLATIONS_JSON_SQL}
+FROM translation_keys k
+WHERE k.id = $1
+"""
+
+# Rows requested per page of a locale export; must not exceed PostgREST's
+# max_rows (1000 on Supabase), which would otherwise cut pages short
+LOCALIZATIONS_PAGE_SIZE = 1000
+
+# Every translation of one locale in a project, keyed by translation key
+LOCALIZATIONS_SQL = """
+SELECT k.key, t.value
+FROM translations t
+JOIN translation_keys k ON k.id = t.translation_key_id
+WHERE k.project_id = $1 AND t.language_code = $2
+"""
+
+# Maximum number of rows sent in one bulk upsert request
+BULK_UPSERT_BATCH_SIZE = 1000
+
+# Upsert every row of a bulk update in one statement, so they are all
+# written or none are
+BULK_UPSERT_SQL = """
+INSERT INTO translations (translation_key_id, language_code, value, updated_by)
+SELECT u.translation_key_id, u.language_code, u.value, $4
+FROM unnest($1::uuid[], $2::text[], $3::text[]) AS u(translation_key_id, language_code, value)
+ON CONFLICT (translation_key_id, language_code)
+DO UPDATE SET value = EXCLUDED.value, updated_by = EXCLUDED.updated_by
+"""
+
+# SQL condition for each search operator chosen by _choose_search
+SEARCH_CONDITIONS = {
+    "eq": "k.key = ${}",
+    "like": "k.key LIKE ${}",
+    "ilike": "k.key ILIKE ${}",
+    "fts": "k.search_tsv @@ websearch_to_tsquery('simple', ${})"
+}
+
+def _choose_search(search: str) -> Tuple[str, str]:
+    """Pick the cheapest key search operator and pattern for a search string
+
+    - "exact.key" (quoted) matches the key exactly, via the unique index
+    - prefix* matches keys starting with prefix (case-sensitive), via btree
+    - several words are matched word by word against the key parts and
+      description with the full-text index; keys never contain whitespace,
+      so such a search can't match one as a substring
+    - anything else is a case-insensitive substring match on the trigram index
+
+    LIKE wildcards in the search are escaped so they match literally. A "*"
+    can't be escaped for PostgREST, which reads it as a wildcard, so callers
+    only allow it as the trailing prefix marker.
+    """
+    if len(search) >= 2 and search[0] == search[-1] == '"':
+        return "eq", search[1:-1]
+    if len(search) >= 2 and search[-1] == "*":
+        return "like", _escape_like(search[:-1]) + "%"
+    if len(search.split()) > 1:
+        return "fts", search
+    return "ilike", f"%{_escape_like(search)}%"
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards, using Postgres' default backslash escape"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+class BulkUpdateError(Exception):
+    """A bulk update failed after some of its batches were already saved"""
+    def __init__(self, updated_count: int, error: Exception):
+        super().__init__(str(error))
+        self.updated_count = updated_count
 
 class TranslationService:
 
+    def __init__(self):
+        # Projects and their languages change rarely, so keep them briefly in memory
+        self._projects_cache = TTLCache(maxsize=1, ttl=60)
+        # Lets only one request refill the projects cache when it expires
+        self._projects_lock = asyncio.Lock()
+
+    def invalidate_projects(self) -> None:
+        """Drop the cached projects after a project or its languages change"""
+        self._projects_cache.clear()
+
+    @property
+    def supabase(self) -> AsyncClient:
+        """Shared async Supabase client"""
+        return get_supabase_client()
+
+    @property
+    def pool(self) -> Optional[asyncpg.Pool]:
+        """Direct Postgres pool for hot paths, or None to use PostgREST"""
+        return get_postgres_pool()
+
     async def get_translation_keys(
         self,
         project_id: str,
@@ -14,107 +162,188 @@ class TranslationService:
         search: Optional[str] = None,
         category: Optional[str] = None,
         language_code: Optional[str] = None,
-        missing_translations: Optional[bool] = None
+        missing_translations: Optional[bool] = None,
+        exact_count: bool = False
     ) -> Tuple[List[TranslationKey], int]:
         """Get translation keys with optional filtering"""
+        offset = (page - 1) * limit
 
-        # Build query
-        query = supabase.table("translation_keys").select(
-            """
-            id, key, category, description, created_at, updated_at,
-            translations(language_code, value, updated_at, updated_by)
-            """
-        ).eq("project_id", project_id)
-
-        # Apply filters
-        if search:
-            query = query.ilike("key", f"%{search}%")
-        if category:
-            query = query.eq("category", category)
-
-        # Get all filtered data first to apply missing translations filter and calculate correct count
-        result = query.execute()
-
-        # Transform data and apply missing translations filter
-        filtered_translation_keys = []
-        for row in result.data:
-            translations = {}
-            for trans in row.get("translations", []):
-                translations[trans["language_code"]] = Translation(
-                    value=trans["value"],
-                    updated_at=datetime.fromisoformat(trans["updated_at"].replace("Z", "+00:00")),
-                    updated_by=trans["updated_by"]
-                )
-
-            # Apply missing translations filter if requested
-            if missing_translations:
-                if language_code:
-                    # Show only keys that are MISSING the specified language translation
-                    translation = translations.get(language_code)
-                    if translation and translation.value and translation.value.strip():
-                        continue  # Skip keys that have a valid translation for this language
-                else:
-                    # Show only keys that are missing translations for ANY language
-                    # Get all languages for this project first
-                    project_languages_result = supabase.table("project_languages").select("language_code").eq("project_id", project_id).execute()
-                    project_language_codes = [lang["language_code"] for lang in project_languages_result.data]
-
-                    # Check if this key has translations for all project languages
-                    has_all_translations = True
-                    for lang_code in project_language_codes:
-                        translation = translations.get(lang_code)
-                        if not translation or not translation.value or not translation.value.strip():
-                            has_all_translations = False
-                            break
-
-                    if has_all_translations:
-                        continue  # Skip keys that have all translations
-
-            translation_key = TranslationKey(
-                id=row["id"],
-                key=row["key"],
-                category=row["category"],
-                description=row.get("description"),
-                translations=translations
+        if self.pool is not None:
+            return await self._get_translation_keys_from_postgres(
+                project_id, offset, limit, search, category, language_code, missing_translations
             )
-            filtered_translation_keys.append(translation_key)
 
-        # Calculate total after all filters are applied
-        total = len(filtered_translation_keys)
+        if not missing_translations:
+            # The planner's row estimate is enough for paging through the full
+            # table and spares Postgres an exact count over every matching key
+            count = "exact" if exact_count else "planned"
+            query = self.supabase.table("translation_keys").select(TRANSLATION_KEY_COLUMNS, count=count)
+        elif language_code:
+            # Keys without a non-blank translation for the language
+            query = self.supabase.rpc(
+                "translation_keys_missing_language",
+                {"p_language_code": language_code},
+                count="exact"
+            ).select(TRANSLATION_KEY_COLUMNS)
+        else:
+            # Keys without a non-blank translation for at least one project language
+            query = self.supabase.rpc(
+                "translation_keys_missing_any_language", {}, count="exact"
+            ).select(TRANSLATION_KEY_COLUMNS)
+
+        # Let the database filter, paginate and count in the same request, so only
+        # one page is transferred and the total comes back in Content-Range
+        result = await self._filter_translation_keys(
+            query, project_id, search, category
+        ).order("key").range(offset, offset + limit - 1).execute()
+
+        total = result.count or 0
+        if not result.data:
+            # Nothing at this offset, so there are at most offset keys; the
+            # planner never estimates fewer than one row
+            total = min(total, offset)
+        elif len(result.data) < limit:
+            # A partial page is the last one, which pins down the exact total
+            total = offset + len(result.data)
+        else:
+            # An estimate can fall short of the rows actually returned
+            total = max(total, offset + len(result.data))
+        return [self._build_translation_key(row) for row in result.data], total
+
+    async def _get_translation_keys_from_postgres(
+        self,
+        project_id: str,
+        offset: int,
+        limit: int,
+        search: Optional[str],
+        category: Optional[str],
+        language_code: Optional[str],
+        missing_translations: Optional[bool]
+    ) -> Tuple[List[TranslationKey], int]:
+        """Get a page of translation keys and their total in one SQL query"""
+        args = [project_id]
+        if not missing_translations:
+            source = "translation_keys"
+        elif language_code:
+            args.append(language_code)
+            source = f"translation_keys_missing_language(${len(args)})"
+        else:
+            source = "translation_keys_missing_any_language()"
+
+        conditions = self._translation_key_conditions(args, search, category)
+        args += [limit, offset]
+
+        row = await self.pool.fetchrow(
+            TRANSLATION_KEYS_PAGE_SQL.format(
+                source=source,
+                conditions=conditions,
+                limit=len(args) - 1,
+                offset=len(args)
+            ),
+            *args
+        )
 
-        # Apply pagination to the filtered results
-        offset = (page - 1) * limit
-        paginated_keys = filtered_translation_keys[offset:offset + limit]
+        return [self._build_translation_key(key) for key in row["keys"] or ()], row["total"]
 
-        return paginated_keys, total
+    async def iter_translation_keys(
+        self,
+        project_id: str,
+        search: Optional[str] = None,
+        category: Optional[str] = None,
+        page_size: int = 100
+    ) -> AsyncIterator[TranslationKey]:
+        """Yield every matching translation key, fetching one page at a time"""
+        if self.pool is not None:
+            # A single query read through a server-side cursor; rows are
+            # yielded as they arrive instead of re-running the query per page
+            args = [project_id]
+            conditions = self._translation_key_conditions(args, search, category)
+            async with self.pool.acquire() as conn:
+                async with conn.transaction():
+                    async for row in conn.cursor(
+                        TRANSLATION_KEYS_STREAM_SQL.format(conditions=conditions), *args, prefetch=page_size
+                    ):
+                        yield self._build_translation_key(row)
+            return
+
+        offset = 0
+        while True:
+            result = await self._filter_translation_keys(
+                self.supabase.table("translation_keys").select(TRANSLATION_KEY_COLUMNS),
+                project_id, search, category
+            ).order("key").range(offset, offset + page_size - 1).execute()
+
+            for row in result.data:
+                yield self._build_translation_key(row)
+
+            if len(result.data) < page_size:
+                return
+            offset += page_size
+
+    @staticmethod
+    def _translation_key_conditions(args: List, search: Optional[str], category: Optional[str]) -> str:
+        """Build the SQL WHERE conditions for a translation key listing
+
+        args must start with the project id; search and category values are
+        appended to it as query parameters.
+        """
+        conditions = ["k.project_id = $1"]
+        if search:
+            operator, pattern = _choose_search(search)
+            args.append(pattern)
+            conditions.append(SEARCH_CONDITIONS[operator].format(len(args)))
+        if category:
+            args.append(category)
+            conditions.append(f"k.category = ${len(args)}")
+        return " AND ".join(conditions)
+
+    @staticmethod
+    def _filter_translation_keys(query, project_id: str, search: Optional[str], category: Optional[str]):
+        """Apply the project, search and category filters to a translation_keys query"""
+        query = query.eq("project_id", project_id)
+        if search:
+            operator, pattern = _choose_search(search)
+            if operator == "fts":
+                query = query.filter("search_tsv", "wfts(simple)", pattern)
+            else:
+                query = query.filter("key", operator, pattern)
+        if category:
+            query = query.eq("category", category)
+        return query
 
     async def get_translation_key_by_id(self, key_id: str) -> Optional[TranslationKey]:
         """Get a single translation key by ID"""
-        result = supabase.table("translation_keys").select(
-            """
-            id, key, category, description, created_at, updated_at,
-            translations(language_code, value, updated_at, updated_by)
-            """
+        if self.pool is not None:
+            row = await self.pool.fetchrow(TRANSLATION_KEY_BY_ID_SQL, key_id)
+            return self._build_translation_key(row) if row else None
+
+        result = await self.supabase.table("translation_keys").select(
+            TRANSLATION_KEY_COLUMNS
         ).eq("id", key_id).execute()
 
         if not result.data:
             return None
 
-        row = result.data[0]
-        translations = {}
-        for trans in row.get("translations", []):
-            translations[trans["language_code"]] = Translation(
-                value=trans["value"],
-                updated_at=datetime.fromisoformat(trans["updated_at"].replace("Z", "+00:00")),
-                updated_by=trans["updated_by"]
-            )
+        return self._build_translation_key(result.data[0])
 
-        return TranslationKey(
+    @staticmethod
+    def _build_translation_key(row: Dict) -> TranslationKey:
+        """Build a TranslationKey from a translation_keys row with embedded translations"""
+        # Rows come straight from the database, so skip pydantic validation and
+        # only parse the ISO timestamps PostgREST returns
+        return TranslationKey.model_construct(
             id=row["id"],
             key=row["key"],
             category=row["category"],
             description=row.get("description"),
-            translations=translations
+            translations={
+                trans["language_code"]: Translation.model_construct(
+                    value=trans["value"],
+                    updated_at=datetime.fromisoformat(trans["updated_at"]),
+                    updated_by=trans["updated_by"]
+                )
+                for trans in row.get("translations") or ()
+            }
         )
 
     async def create_translation_key(
@@ -126,38 +355,24 @@ class TranslationService:
         initial_translations: Optional[Dict[str, str]] = None
     ) -> TranslationKey:
         """Create a new translation key"""
-        key_id = str(uuid.uuid4())
-
-        # Insert translation key
-        key_data = {
-            "id": key_id,
-            "key": key,
-            "category": category,
-            "project_id": project_id,
-            "description": description
-        }
-
-        supabase.table("translation_keys").insert(key_data).execute()
-
-        # Insert initial translations if provided
-        if initial_translations:
-            translation_data = []
-            current_time = datetime.utcnow().isoformat()
-            for lang_code, value in initial_translations.items():
-                translation_data.append({
-                    "id": str(uuid.uuid4()),
-                    "translation_key_id": key_id,
-                    "language_code": lang_code,
-                    "value": value,
-                    "updated_by": "system",
-                    "updated_at": current_time
-                })
+        # The key and its initial translations are inserted atomically in one
+        # round trip, and the function returns the created key as JSON
+        if self.pool is not None:
+            row = await self.pool.fetchval(
+                "SELECT create_translation_key_with_translations($1, $2, $3, $4, $5)",
+                key, category, project_id, description, initial_translations or {}
+            )
+            return self._build_translation_key(row)
 
-            if translation_data:
-                supabase.table("translations").insert(translation_data).execute()
+        result = await self.supabase.rpc("create_translation_key_with_translations", {
+            "p_key": key,
+            "p_category": category,
+            "p_project_id": project_id,
+            "p_description": description,
+            "p_translations": initial_translations or {}
+        }).execute()
 
-        # Return the created key
-        return await self.get_translation_key_by_id(key_id)
+        return self._build_translation_key(result.data)
 
     async def update_translation(
         self,
@@ -166,133 +381,201 @@ class TranslationService:
         value: str,
         updated_by: str = "system"
     ) -> bool:
-        """Update a translation value"""
+        """Create or update a translation value with a single upsert"""
+        if self.pool is not None:
+            await self.pool.execute(
+                """
+                INSERT INTO translations (translation_key_id, language_code, value, updated_by)
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (translation_key_id, language_code)
+                DO UPDATE SET value = EXCLUDED.value, updated_by = EXCLUDED.updated_by
+                """,
+                key_id, language_code, value, updated_by
+            )
+            return True
 
-        # Check if translation exists
-        existing = supabase.table("translations").select("id").eq("translation_key_id", key_id).eq("language_code", language_code).execute()
+        await self.supabase.table("translations").upsert({
+            "translation_key_id": key_id,
+            "language_code": language_code,
+            "value": value,
+            "updated_by": updated_by
+        }, on_conflict="translation_key_id,language_code", returning=ReturnMethod.minimal).execute()
 
-        current_time = datetime.utcnow().isoformat()
+        return True
 
-        if existing.data:
-            # Update existing translation
-            supabase.table("translations").update({
-                "value": value,
-                "updated_by": updated_by,
-                "updated_at": current_time
-            }).eq("translation_key_id", key_id).eq("language_code", language_code).execute()
-        else:
-            # Create new translation
-            supabase.table("translations").insert({
-                "id": str(uuid.uuid4()),
+    async def create_translation_if_absent(
+        self,
+        key_id: str,
+        language_code: str,
+        value: str,
+        updated_by: str = "system"
+    ) -> Optional[bool]:
+        """Create a translation unless one already exists for the language
+
+        Returns True if the translation was created, False if the key already
+        has a translation for this language, and None if the key does not exist.
+        """
+        try:
+            # id and updated_at are filled in by the column defaults
+            result = await self.supabase.table("translations").upsert({
                 "translation_key_id": key_id,
                 "language_code": language_code,
                 "value": value,
-                "updated_by": updated_by,
-                "updated_at": current_time
-            }).execute()
+                "updated_by": updated_by
+            }, on_conflict="translation_key_id,language_code", ignore_duplicates=True).execute()
+        except APIError as e:
+            # 23503: foreign_key_violation on the translation key reference
+            if e.code == "23503" and "translation_key_id" in (e.details or ""):
+                return None
+            raise
 
-        return True
+        return bool(result.data)
 
-    async def bulk_update_translations(self, updates: List[Dict]) -> int:
-        """Bulk update multiple translations"""
-        success_count = 0
+    async def bulk_update_translations(
+        self,
+        updates: List[UpdateTranslationRequest],
+        updated_by: str = "system"
+    ) -> int:
+        """Bulk update multiple translations
+
+        With the Postgres pool all rows are written in one statement. Over
+        PostgREST they are sent in batches, and BulkUpdateError reports the
+        rows saved before a failing batch.
+        """
+        if not updates:
+            return 0
+
+        # One row per (key, language); a later update in the batch wins, as
+        # Postgres cannot upsert the same row twice in one statement
+        rows = {
+            (update.key_id, update.language_code): {
+                "translation_key_id": update.key_id,
+                "language_code": update.language_code,
+                "value": update.value,
+                "updated_by": updated_by
+            }
+            for update in updates
+        }
 
-        for update in updates:
+        rows = list(rows.values())
+        if self.pool is not None:
+            status = await self.pool.execute(
+                BULK_UPSERT_SQL,
+                [row["translation_key_id"] for row in rows],
+                [row["language_code"] for row in rows],
+                [row["value"] for row in rows],
+                updated_by
+            )
+            # Command tag is "INSERT 0 <rows>"
+            return int(status.rsplit(" ", 1)[1])
+
+        # Upsert in batches to keep each request under PostgREST's payload limit;
+        # rows are counted rather than echoed back. Each batch commits on its
+        # own, so a failure reports how many rows were already saved.
+        updated_count = 0
+        for start in range(0, len(rows), BULK_UPSERT_BATCH_SIZE):
             try:
-                await self.update_translation(
-                    update["key_id"],
-                    update["language_code"],
-                    update["value"],
-                    update.get("updated_by", "system")
-                )
-                success_count += 1
+                result = await self.supabase.table("translations").upsert(
+                    rows[start:start + BULK_UPSERT_BATCH_SIZE],
+                    on_conflict="translation_key_id,language_code",
+                    count="exact",
+                    returning=ReturnMethod.minimal
+                ).execute()
             except Exception as e:
-                # Log error but continue with other updates
-                print(f"Failed to update translation: {e}")
-                continue
+                if updated_count:
+                    raise BulkUpdateError(updated_count, e) from e
+                raise
+            updated_count += result.count or 0
 
-        return success_count
+        return updated_count
 
     async def delete_translation_key(self, key_id: str) -> bool:
-        """Delete a translation key and all its associated translations"""
-        try:
-            # Check if translation key exists
-            existing_key = await self.get_translation_key_by_id(key_id)
-            if not existing_key:
-                return False
-
-            # Delete all translations for this key first (due to foreign key constraints)
-            supabase.table("translations").delete().eq("translation_key_id", key_id).execute()
-
-            # Delete the translation key
-            result = supabase.table("translation_keys").delete().eq("id", key_id).execute()
-
-            return len(result.data) > 0
-        except Exception as e:
-            print(f"Failed to delete translation key: {e}")
-            return False
+        """Delete a translation key and all its associated translations
+
+        Returns False if the translation key does not exist.
+        """
+        # Translations are removed by the ON DELETE CASCADE on translation_key_id
+        result = await self.supabase.table("translation_keys").delete().eq("id", key_id).execute()
+
+        return len(result.data) > 0
+
+    async def get_localizations(self, project_id: str, locale: str) -> Dict[str, str]:
+        """Get a flat key -> value mapping of one locale's translations"""
+        if self.pool is not None:
+            rows = await self.pool.fetch(LOCALIZATIONS_SQL, project_id, locale)
+            return {row["key"]: row["value"] for row in rows}
+
+        # PostgREST caps each response at max_rows, so read the whole locale
+        # in pages ordered by the unique id
+        localizations = {}
+        offset = 0
+        while True:
+            result = await self.supabase.table("translations").select(
+                "value, translation_keys!inner(key)"
+            ).eq("language_code", locale).eq("translation_keys.project_id", project_id).order(
+                "id"
+            ).range(offset, offset + LOCALIZATIONS_PAGE_SIZE - 1).execute()
+
+            for row in result.data:
+                localizations[row["translation_keys"]["key"]] = row["value"]
+
+            if len(result.data) < LOCALIZATIONS_PAGE_SIZE:
+                return localizations
+            offset += LOCALIZATIONS_PAGE_SIZE
 
     async def get_projects(self) -> List[Project]:
         """Get all projects with their languages"""
-        result = supabase.table("projects").select(
+        cached_projects = self._projects_cache.get("projects")
+        if cached_projects is not None:
+            return cached_projects
+
+        async with self._projects_lock:
+            # Another request may have refilled the cache while we waited
+            cached_projects = self._projects_cache.get("projects")
+            if cached_projects is not None:
+                return cached_projects
+
+            projects = await self._fetch_projects()
+            self._projects_cache["projects"] = projects
+            return projects
+
+    async def _fetch_projects(self) -> List[Project]:
+        """Fetch all projects with their languages from the database"""
+        result = await self.supabase.table("projects").select(
             """
             id, name, description, created_at, updated_at,
-            project_languages(language_code, languages(code, name, flag))
+            project_languages(languages(code, name, flag))
             """
         ).execute()
 
-        projects = []
-        for row in result.data:
-            languages = []
-            for pl in row.get("project_languages", []):
-                lang_data = pl["languages"]
-                languages.append(Language(
-                    code=lang_data["code"],
-                    name=lang_data["name"],
-                    flag=lang_data.get("flag")
-                ))
-
-            projects.append(Project(
+        # Rows come straight from the database, so skip pydantic validation
+        projects = [
+            Project.model_construct(
                 id=row["id"],
                 name=row["name"],
                 description=row.get("description"),
-                languages=languages,
-                created_at=datetime.fromisoformat(row["created_at"].replace("Z", "+00:00")),
-                updated_at=datetime.fromisoformat(row["updated_at"].replace("Z", "+00:00"))
-            ))
+                languages=[
+                    Language.model_construct(
+                        code=pl["languages"]["code"],
+                        name=pl["languages"]["name"],
+                        flag=pl["languages"].get("flag")
+                    )
+                    for pl in row.get("project_languages") or ()
+                ],
+                created_at=datetime.fromisoformat(row["created_at"]),
+                updated_at=datetime.fromisoformat(row["updated_at"])
+            )
+            for row in result.data
+        ]
 
         return projects
 
     async def get_analytics(self, project_id: str) -> Dict:
         """Get analytics for translation completion"""
+        # Counts and percentages are computed by the database, which returns
+        # the response as a single JSON object
+        if self.pool is not None:
+            return await self.pool.fetchval("SELECT translation_analytics($1)", project_id)
 
-        # Get total keys
-        keys_result = supabase.table("translation_keys").select("id", count="exact").eq("project_id", project_id).execute()
-        total_keys = keys_result.count if keys_result.count else 0
-
-        # Get completion by language
-        languages_result = supabase.table("project_languages").select("language_code").eq("project_id", project_id).execute()
-
-        completion_by_language = {}
-        for lang_row in languages_result.data:
-            lang_code = lang_row["language_code"]
-
-            # Count translations for this language
-            trans_result = supabase.table("translations").select(
-                "id", count="exact"
-            ).eq("language_code", lang_code).execute()
-
-            completed = trans_result.count if trans_result.count else 0
-
-            completion_by_language[lang_code] = {
-                "completed": completed,
-                "total": total_keys,
-                "percentage": round((completed / total_keys * 100) if total_keys > 0 else 0, 2)
-            }
-
-        return {
-            "project_id": project_id,
-            "total_keys": total_keys,
-            "completion_by_language": completion_by_language,
-            "last_updated": datetime.utcnow()
-        }
\ No newline at end of file
+        result = await self.supabase.rpc("translation_analytics", {"p_project_id": project_id}).execute()
+        return result.data
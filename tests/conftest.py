@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Settings are read when the app is imported, so configure them first
+os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test-service-key")
+os.environ["AUTH_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "auth.db")
@@ -0,0 +1,144 @@
+import secrets
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.localization_management_api.main import app, get_bearer_token, get_translation_service
+
+# The lifespan is not entered, so no Supabase or Postgres connection is made
+client = TestClient(app)
+
+@pytest.fixture
+def credentials():
+    """Register a fresh user and return its username and password"""
+    username = f"user_{secrets.token_hex(4)}"
+    password = "secret123"
+    response = client.post("/auth/register", json={
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": password,
+        "full_name": "Test User"
+    })
+    assert response.status_code == 200
+    return username, password
+
+def login(username: str, password: str):
+    return client.post("/auth/login", json={"username": username, "password": password})
+
+def auth_header(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+def test_register_rejects_duplicate_username(credentials):
+    username, password = credentials
+    response = client.post("/auth/register", json={
+        "username": username,
+        "email": f"other_{username}@example.com",
+        "password": password,
+        "full_name": "Test User"
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username already exists"
+
+def test_login_and_me(credentials):
+    username, password = credentials
+    response = login(username, password)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["token_type"] == "bearer"
+    assert body["user"]["username"] == username
+
+    me = client.get("/auth/me", headers=auth_header(body["access_token"]))
+    assert me.status_code == 200
+    assert me.json()["username"] == username
+
+def test_login_rejects_wrong_password(credentials):
+    username, _ = credentials
+    assert login(username, "wrong-password").status_code == 401
+
+def test_me_requires_token():
+    assert client.get("/auth/me").status_code == 401
+    assert client.get("/auth/me", headers=auth_header("not-a-jwt")).status_code == 401
+
+def test_repeated_logins_get_distinct_tokens(credentials):
+    responses = [login(*credentials) for _ in range(3)]
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    tokens = [r.json()["access_token"] for r in responses]
+    assert len(set(tokens)) == 3
+
+def test_logout_revokes_only_that_token(credentials):
+    first = login(*credentials).json()["access_token"]
+    second = login(*credentials).json()["access_token"]
+
+    response = client.post("/auth/logout", headers=auth_header(first))
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+
+    assert client.get("/auth/me", headers=auth_header(first)).status_code == 401
+    assert client.get("/auth/me", headers=auth_header(second)).status_code == 200
+
+@pytest.mark.parametrize("header, token", [
+    ("Bearer abc.def", "abc.def"),
+    ("bearer abc.def", "abc.def"),
+    ("BEARER abc.def", "abc.def"),
+    ("Bearer ", None),
+    ("Basic abc.def", None),
+    ("abc.def", None),
+    ("", None),
+    (None, None),
+])
+def test_get_bearer_token(header, token):
+    assert get_bearer_token(header) == token
+
+def test_bulk_update_checks_auth_before_the_body():
+    response = client.post("/translations/bulk-update", content=b"{not json")
+    assert response.status_code == 401
+
+def test_bulk_update_rejects_malformed_body(credentials):
+    token = login(*credentials).json()["access_token"]
+    response = client.post(
+        "/translations/bulk-update", content=b'{"updates": [{"key_id": "k1"}]}', headers=auth_header(token)
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][:3] == ["body", "updates", 0]
+
+def test_bulk_update_body_is_documented_by_reference():
+    schema = client.get("/openapi.json").json()
+    request_body = schema["paths"]["/translations/bulk-update"]["post"]["requestBody"]
+    assert request_body["content"]["application/json"]["schema"] == {"$ref": "#/components/schemas/BulkUpdateRequest"}
+    assert "updates" in schema["components"]["schemas"]["BulkUpdateRequest"]["properties"]
+
+def test_register_rejects_password_over_bcrypt_limit():
+    username = f"user_{secrets.token_hex(4)}"
+    response = client.post("/auth/register", json={
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": "x" * 73,
+        "full_name": "Test User"
+    })
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "password"]
+
+def test_login_with_password_over_bcrypt_limit_fails(credentials):
+    username, _ = credentials
+    assert login(username, "x" * 100).status_code == 401
+
+class FakeBulkUpdateService:
+    async def bulk_update_translations(self, updates, updated_by):
+        return len({(update.key_id, update.language_code) for update in updates})
+
+def test_bulk_update_reports_deduplicated_total(credentials):
+    token = login(*credentials).json()["access_token"]
+    app.dependency_overrides[get_translation_service] = FakeBulkUpdateService
+    try:
+        response = client.post("/translations/bulk-update", headers=auth_header(token), json={"updates": [
+            {"key_id": "k1", "language_code": "fr", "value": "a"},
+            {"key_id": "k2", "language_code": "fr", "value": "b"},
+            {"key_id": "k1", "language_code": "fr", "value": "c"},
+        ]})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["message"] == "Updated 2 out of 2 translations"
+    assert (body["updated_count"], body["unique_requested"], body["total_requested"]) == (2, 2, 3)
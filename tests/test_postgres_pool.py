@@ -0,0 +1,101 @@
+import asyncio
+
+import orjson
+import pytest
+
+from src.localization_management_api import database
+from src.localization_management_api.models import UpdateTranslationRequest
+from src.localization_management_api.services import TranslationService
+
+class FakePool:
+    """Records the queries sent to the pool and answers them with canned results"""
+    def __init__(self, result=None):
+        self.result = result
+        self.queries = []
+
+    async def _query(self, query, *args):
+        self.queries.append((query, args))
+        return self.result
+
+    fetch = fetchrow = fetchval = execute = _query
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(database, "_pool", pool)
+    return pool
+
+def test_translation_keys_page_query(pool):
+    pool.result = {
+        "total": 12,
+        "keys": [{
+            "id": "k1",
+            "key": "button.save",
+            "category": "buttons",
+            "description": None,
+            "translations": [{
+                "language_code": "fr",
+                "value": "Enregistrer",
+                "updated_at": "2024-01-01T00:00:00+00:00",
+                "updated_by": "system"
+            }]
+        }]
+    }
+
+    keys, total = asyncio.run(TranslationService().get_translation_keys(
+        "p", page=3, limit=5, search="button.*", category="buttons",
+        language_code="fr", missing_translations=True
+    ))
+
+    assert total == 12
+    assert [key.key for key in keys] == ["button.save"]
+    assert keys[0].translations["fr"].value == "Enregistrer"
+
+    # The language parameter of the source shifts every later placeholder
+    [(query, args)] = pool.queries
+    assert "FROM translation_keys_missing_language($2) k" in query
+    assert "k.project_id = $1 AND k.key LIKE $3 AND k.category = $4" in query
+    assert "LIMIT $5 OFFSET $6" in query
+    assert args == ("p", "fr", "button.%", "buttons", 5, 10)
+
+def test_translation_keys_page_query_without_matches(pool):
+    pool.result = {"total": 0, "keys": None}
+    keys, total = asyncio.run(TranslationService().get_translation_keys("p", search="save"))
+
+    assert (keys, total) == ([], 0)
+    [(query, args)] = pool.queries
+    assert "FROM translation_keys k" in query
+    assert "k.project_id = $1 AND k.key ILIKE $2" in query
+    assert "LIMIT $3 OFFSET $4" in query
+    assert args == ("p", "%save%", 50, 0)
+
+def test_bulk_update_reads_the_command_tag(pool):
+    pool.result = "INSERT 0 2"
+    updates = [
+        UpdateTranslationRequest(key_id="k1", language_code="fr", value="a"),
+        UpdateTranslationRequest(key_id="k2", language_code="fr", value="b"),
+        UpdateTranslationRequest(key_id="k1", language_code="fr", value="c"),
+    ]
+
+    updated = asyncio.run(TranslationService().bulk_update_translations(updates, updated_by="u"))
+
+    assert updated == 2
+    # Duplicate (key, language) pairs collapse to the last value
+    [(_, args)] = pool.queries
+    assert args == (["k1", "k2"], ["fr", "fr"], ["c", "b"], "u")
+
+class FakeConnection:
+    def __init__(self):
+        self.codecs = {}
+
+    async def set_type_codec(self, type_name, encoder, decoder, schema):
+        self.codecs[(schema, type_name)] = (encoder, decoder)
+
+def test_init_connection_uses_orjson_codecs():
+    conn = FakeConnection()
+    asyncio.run(database._init_connection(conn))
+
+    assert set(conn.codecs) == {("pg_catalog", "json"), ("pg_catalog", "jsonb")}
+    for encoder, decoder in conn.codecs.values():
+        assert encoder({"a": [1, "é"]}) == orjson.dumps({"a": [1, "é"]}).decode()
+        assert decoder('{"a": [1]}') == {"a": [1]}
@@ -0,0 +1,122 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from supabase import AsyncClient
+from supabase.lib.client_options import AsyncClientOptions
+
+from src.localization_management_api import database
+from src.localization_management_api.models import UpdateTranslationRequest
+from src.localization_management_api.services import (
+    BULK_UPSERT_BATCH_SIZE, LOCALIZATIONS_PAGE_SIZE, BulkUpdateError, TranslationService, _choose_search
+)
+
+def make_key(index: int) -> dict:
+    return {
+        "id": f"k{index}",
+        "key": f"button.key{index}",
+        "category": "buttons",
+        "description": None,
+        "translations": []
+    }
+
+def use_postgrest(monkeypatch, handler):
+    """Route the service's Supabase client to a mock PostgREST handler"""
+    client = AsyncClient(
+        "https://example.supabase.co",
+        "eyJhbGciOiJIUzI1NiJ9.e30.signature",
+        AsyncClientOptions(httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    )
+    monkeypatch.setattr(database, "_client", client)
+    monkeypatch.setattr(database, "_pool", None)
+
+@pytest.fixture
+def postgrest(monkeypatch):
+    """Serve translation key listings from a canned page and Content-Range total"""
+    page = {"rows": [], "total": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        rows = page["rows"]
+        return httpx.Response(200, json=rows, headers={"content-range": f"0-{max(len(rows) - 1, 0)}/{page['total']}"})
+
+    use_postgrest(monkeypatch, handler)
+    return page
+
+def get_total(page: int, limit: int) -> int:
+    _, total = asyncio.run(TranslationService().get_translation_keys("p", page=page, limit=limit))
+    return total
+
+def test_partial_page_overrides_high_estimate(postgrest):
+    postgrest.update(rows=[make_key(i) for i in range(3)], total=500)
+    assert get_total(page=1, limit=50) == 3
+    assert get_total(page=3, limit=50) == 103
+
+    postgrest.update(rows=[], total=1)
+    assert get_total(page=1, limit=50) == 0
+    postgrest.update(rows=[], total=500)
+    assert get_total(page=3, limit=50) == 100
+
+def test_full_page_raises_low_estimate(postgrest):
+    postgrest.update(rows=[make_key(i) for i in range(10)], total=4)
+    assert get_total(page=2, limit=10) == 20
+
+def test_full_page_keeps_estimate(postgrest):
+    postgrest.update(rows=[make_key(i) for i in range(10)], total=500)
+    assert get_total(page=1, limit=10) == 500
+
+def test_bulk_update_reports_rows_saved_before_a_failing_batch(monkeypatch):
+    batches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        rows = json.loads(request.content)
+        batches.append(len(rows))
+        if len(batches) == 2:
+            return httpx.Response(409, json={"code": "23503", "message": "foreign key violation"})
+        return httpx.Response(201, headers={"content-range": f"*/{len(rows)}"})
+
+    use_postgrest(monkeypatch, handler)
+    updates = [
+        UpdateTranslationRequest(key_id=f"k{index}", language_code="fr", value="v")
+        for index in range(BULK_UPSERT_BATCH_SIZE + 1)
+    ]
+
+    with pytest.raises(BulkUpdateError) as error:
+        asyncio.run(TranslationService().bulk_update_translations(updates))
+    assert error.value.updated_count == BULK_UPSERT_BATCH_SIZE
+    assert batches == [BULK_UPSERT_BATCH_SIZE, 1]
+
+def test_localizations_read_every_page(monkeypatch):
+    total_rows = LOCALIZATIONS_PAGE_SIZE * 2 + 5
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.params)
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        rows = [
+            {"value": f"v{index}", "translation_keys": {"key": f"key{index}"}}
+            for index in range(offset, min(offset + limit, total_rows))
+        ]
+        return httpx.Response(200, json=rows)
+
+    use_postgrest(monkeypatch, handler)
+    localizations = asyncio.run(TranslationService().get_localizations("p", "fr"))
+
+    assert len(localizations) == total_rows
+    assert localizations[f"key{total_rows - 1}"] == f"v{total_rows - 1}"
+    assert [params["order"] for params in requests] == ["id.asc"] * 3
+
+@pytest.mark.parametrize("search, expected", [
+    ('"button.save"', ("eq", "button.save")),
+    ("button.*", ("like", "button.%")),
+    ("save", ("ilike", "%save%")),
+    ("save button", ("fts", "save button")),
+    ("*", ("ilike", "%*%")),
+    ('"', ("ilike", '%"%')),
+    ("error_", ("ilike", "%error\\_%")),
+    ("100%*", ("like", "100\\%%")),
+    ("a\\b*", ("like", "a\\\\b%")),
+])
+def test_choose_search(search, expected):
+    assert _choose_search(search) == expected
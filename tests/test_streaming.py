@@ -0,0 +1,49 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from src.localization_management_api.main import app, get_translation_service
+from src.localization_management_api.models import TranslationKey
+
+class FakeTranslationService:
+    """Yields enough keys for the listing to pass the gzip size threshold"""
+    async def iter_translation_keys(self, project_id, search=None, category=None):
+        for index in range(50):
+            await asyncio.sleep(0)
+            yield TranslationKey.model_construct(
+                id=f"k{index}", key=f"button.key{index}", category="buttons",
+                description="A fairly descriptive text for the key", translations={}
+            )
+
+def test_stream_is_not_gzipped():
+    app.dependency_overrides[get_translation_service] = FakeTranslationService
+    try:
+        client = TestClient(app)
+        with client.stream(
+            "GET", "/projects/p/translation-keys/stream", headers={"Accept-Encoding": "gzip"}
+        ) as response:
+            assert response.status_code == 200
+            assert "content-encoding" not in response.headers
+            lines = list(response.iter_lines())
+    finally:
+        app.dependency_overrides.clear()
+
+    assert len(lines) == 50
+    assert lines[0].startswith('{"id":"k0"')
+
+def test_other_responses_are_still_gzipped():
+    # The OpenAPI document is well above the compression threshold
+    client = TestClient(app)
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+
+def test_search_only_allows_a_trailing_star():
+    app.dependency_overrides[get_translation_service] = FakeTranslationService
+    try:
+        client = TestClient(app)
+        for path in ("/projects/p/translation-keys", "/projects/p/translation-keys/stream"):
+            assert client.get(path, params={"search": "a*b*"}).status_code == 422
+            assert client.get(path, params={"search": "*"}).status_code == 422
+        assert client.get("/projects/p/translation-keys/stream", params={"search": "button.*"}).status_code == 200
+    finally:
+        app.dependency_overrides.clear()